@@ -1,19 +1,31 @@
 from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import logging
 import asyncio
+import functools
+import os
 import sys
+import time
+from contextlib import asynccontextmanager
 from concurrent.futures import ThreadPoolExecutor
 
 # Import the scraper function (adjust path if necessary)
 try:
-    from gmaps_scraper_server.scraper import scrape_google_maps
+    from gmaps_scraper_server.scraper import scrape_google_maps, scrape_google_maps_batch, scrape_places, DEFAULT_BATCH_CONCURRENCY
 except ImportError:
     # Handle case where scraper might be in a different structure later
     logging.error("Could not import scrape_google_maps from scraper.py")
     # Define a dummy function to allow API to start, but fail on call
     def scrape_google_maps(*args, **kwargs):
         raise ImportError("Scraper function not available.")
+    def scrape_google_maps_batch(*args, **kwargs):
+        raise ImportError("Scraper function not available.")
+    def scrape_places(*args, **kwargs):
+        raise ImportError("Scraper function not available.")
+    DEFAULT_BATCH_CONCURRENCY = 3
+
+from gmaps_scraper_server.place_store import PlaceStore, DEFAULT_STORE_PATH, normalize_longitude
 
 # Thread pool for running Playwright (Windows compatibility fix)
 executor = ThreadPoolExecutor(max_workers=4)
@@ -30,13 +42,138 @@ def run_scraper_in_thread(query, max_places, lang, headless):
     finally:
         loop.close()
 
+def run_batch_scraper_in_thread(queries, headless, concurrency):
+    """Run the async batch scraper in a new event loop in a thread"""
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(scrape_google_maps_batch(queries, headless, concurrency))
+    finally:
+        loop.close()
+
+def run_places_scraper_in_thread(links, lang, headless, concurrency):
+    """Run the async place detail scraper in a new event loop in a thread"""
+    if sys.platform == 'win32':
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(scrape_places(links, lang, headless, concurrency))
+    finally:
+        loop.close()
+
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Local store of every scraped place, used to answer nearby/bbox lookups without scraping.
+# Opened in the lifespan hook, so importing the app doesn't create the database.
+place_store = None
+
+async def run_store(func, *args):
+    """Runs a blocking place store call in the default thread pool, off the event loop."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+async def save_to_store(places):
+    """Adds scraped places to the local store; a store failure never fails the scrape."""
+    try:
+        stored = await run_store(place_store.add_places, places)
+        logging.info(f"Saved {stored} places to the place store.")
+    except Exception as e:
+        logging.error(f"Failed to save places to the place store: {e}", exc_info=True)
+
+# Scheduled watchlist refresh, enabled by setting WATCHLIST_REFRESH_SECONDS
+WATCHLIST_REFRESH_SECONDS = float(os.getenv("WATCHLIST_REFRESH_SECONDS", "0"))
+WATCHLIST_REFRESH_BATCH_SIZE = int(os.getenv("WATCHLIST_REFRESH_BATCH_SIZE", "100"))
+WATCHLIST_RETRY_SECONDS = float(os.getenv("WATCHLIST_RETRY_SECONDS", "900"))
+
+async def refresh_places(targets, lang, headless, concurrency):
+    """
+    Scrapes only the given (place_key, link) targets and records their snapshots.
+    Returns the number of places checked, the changed places and the keys that failed.
+    """
+    loop = asyncio.get_event_loop()
+    results = await loop.run_in_executor(
+        executor,
+        run_places_scraper_in_thread,
+        [link for _, link in targets],
+        lang,
+        headless,
+        concurrency
+    )
+    places = []
+    failed = []
+    for key, link in targets:
+        place_data = results.get(link)
+        if place_data:
+            place_data['place_key'] = key
+            places.append(place_data)
+        else:
+            failed.append(key)
+    changed = await run_store(place_store.record_snapshots, places)
+    return {"checked": len(places), "changed": changed, "failed": failed}
+
+async def refresh_due_watchlist(limit, headless, concurrency):
+    """
+    Refreshes the most urgent due watchlist places, each in the language it was added with.
+    They are claimed before scraping so a concurrent refresh can't pick them too; places
+    that fail are retried after WATCHLIST_RETRY_SECONDS.
+    """
+    due = await run_store(place_store.claim_due_watchlist, limit)
+    by_lang = {}
+    for entry in due:
+        by_lang.setdefault(entry["lang"], []).append(entry)
+
+    result = {"checked": 0, "changed": [], "failed": []}
+    pending_keys = [entry["place_key"] for entry in due] # Claimed but not yet refreshed
+    for lang, entries in by_lang.items():
+        try:
+            lang_result = await refresh_places([(entry["place_key"], entry["link"]) for entry in entries], lang, headless, concurrency)
+        except Exception:
+            await run_store(place_store.retry_watchlist_later, result["failed"] + pending_keys, WATCHLIST_RETRY_SECONDS)
+            raise
+        refreshed_keys = {entry["place_key"] for entry in entries}
+        pending_keys = [key for key in pending_keys if key not in refreshed_keys]
+        result["checked"] += lang_result["checked"]
+        result["changed"].extend(lang_result["changed"])
+        result["failed"].extend(lang_result["failed"])
+
+    if result["failed"]:
+        await run_store(place_store.retry_watchlist_later, result["failed"], WATCHLIST_RETRY_SECONDS)
+    return result
+
+async def refresh_watchlist_periodically(interval_seconds):
+    """Background loop refreshing due watchlist places every interval_seconds."""
+    while True:
+        try:
+            result = await refresh_due_watchlist(WATCHLIST_REFRESH_BATCH_SIZE, True, DEFAULT_BATCH_CONCURRENCY)
+            if result["checked"] or result["failed"]:
+                logging.info(f"Scheduled watchlist refresh checked {result['checked']} places: {len(result['changed'])} changed, {len(result['failed'])} failed.")
+        except Exception as e:
+            logging.error(f"Scheduled watchlist refresh failed: {e}", exc_info=True)
+        await asyncio.sleep(interval_seconds)
+
+@asynccontextmanager
+async def lifespan(app):
+    global place_store
+    place_store = PlaceStore(DEFAULT_STORE_PATH)
+    logging.info(f"Opened place store at {DEFAULT_STORE_PATH}.")
+    task = None
+    if WATCHLIST_REFRESH_SECONDS > 0:
+        logging.info(f"Refreshing due watchlist places every {WATCHLIST_REFRESH_SECONDS} seconds.")
+        task = asyncio.create_task(refresh_watchlist_periodically(WATCHLIST_REFRESH_SECONDS))
+    yield
+    if task:
+        task.cancel()
+    place_store.close()
+
 app = FastAPI(
     title="Google Maps Scraper API",
     description="API to trigger Google Maps scraping based on a query.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 @app.post("/scrape", response_model=List[Dict[str, Any]])
@@ -62,6 +199,7 @@ async def run_scrape(
             headless
         )
         logging.info(f"Scraping finished for query: '{query}'. Found {len(results)} results.")
+        await save_to_store(results)
         return results
     except asyncio.TimeoutError:
         logging.error(f"Scraping timeout for query '{query}' after 300 seconds")
@@ -99,6 +237,7 @@ async def run_scrape_get(
             headless
         )
         logging.info(f"Scraping finished for query: '{query}'. Found {len(results)} results.")
+        await save_to_store(results)
         return results
     except asyncio.TimeoutError:
         logging.error(f"Scraping timeout for query '{query}' after 300 seconds")
@@ -113,6 +252,237 @@ async def run_scrape_get(
         # Consider more specific error handling based on scraper exceptions
         raise HTTPException(status_code=500, detail=f"An internal error occurred during scraping: {str(e)}\n\nFull trace:\n{error_trace}")
 
+class BatchQuery(BaseModel):
+    query: str = Field(..., description="The search query for Google Maps (e.g., 'restaurants in 98392')")
+    max_places: Optional[int] = Field(None, description="Maximum number of places to scrape for this query. Scrapes all found if None.")
+    lang: str = Field("en", description="Language code for Google Maps results (e.g., 'en', 'es').")
+
+class BatchScrapeRequest(BaseModel):
+    queries: List[BatchQuery] = Field(..., min_length=1, description="Queries to scrape together; places found by several queries are fetched once.")
+    headless: bool = Field(True, description="Run the browser in headless mode (no UI). Set to false for debugging locally.")
+    concurrency: int = Field(DEFAULT_BATCH_CONCURRENCY, ge=1, le=16, description="Number of browser pages worked in parallel across all queries.")
+
+@app.post("/scrape-batch", response_model=Dict[str, Any])
+async def run_scrape_batch(request: BatchScrapeRequest):
+    """
+    Scrapes many related queries over one shared browser and returns each query's
+    place_keys plus one deduplicated list of places.
+    """
+    logging.info(f"Received batch scrape request for {len(request.queries)} queries, headless: {request.headless}, concurrency: {request.concurrency}")
+    try:
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(
+            executor,
+            run_batch_scraper_in_thread,
+            [item.model_dump() for item in request.queries],
+            request.headless,
+            request.concurrency
+        )
+        logging.info(f"Batch scraping finished for {len(request.queries)} queries. Found {len(results['places'])} unique places.")
+        await save_to_store(results["places"])
+        return results
+    except ImportError as e:
+         logging.error(f"ImportError during batch scraping: {e}")
+         raise HTTPException(status_code=500, detail="Server configuration error: Scraper not available.")
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        logging.error(f"An error occurred during batch scraping: {e}\n{error_trace}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An internal error occurred during batch scraping: {str(e)}\n\nFull trace:\n{error_trace}")
+
+async def search_store_with_fallback(search, fallback, fallback_query, min_results, max_places, lang, headless):
+    """
+    Runs a store search and, if fallback is enabled and fewer than min_results fresh places
+    were found, scrapes fallback_query live, saves the results and searches again.
+    """
+    places = await run_store(search)
+    if len(places) >= min_results or not fallback:
+        return {"source": "store", "places": places}
+
+    if not fallback_query:
+        raise HTTPException(status_code=400, detail="A fallback scrape needs fallback_query or category.")
+    logging.info(f"Place store returned {len(places)} places (< {min_results}), scraping '{fallback_query}' live.")
+    try:
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(
+            executor,
+            run_scraper_in_thread,
+            fallback_query,
+            max_places,
+            lang,
+            headless
+        )
+        await save_to_store(results)
+        return {"source": "live", "places": await run_store(search)}
+    except asyncio.TimeoutError:
+        logging.error(f"Fallback scraping timeout for query '{fallback_query}' after 300 seconds")
+        raise HTTPException(status_code=504, detail="Scraping request timed out after 5 minutes")
+    except ImportError as e:
+         logging.error(f"ImportError during fallback scraping for query '{fallback_query}': {e}")
+         raise HTTPException(status_code=500, detail="Server configuration error: Scraper not available.")
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        logging.error(f"An error occurred during fallback scraping for query '{fallback_query}': {e}\n{error_trace}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An internal error occurred during fallback scraping: {str(e)}\n\nFull trace:\n{error_trace}")
+
+@app.get("/places/nearby", response_model=Dict[str, Any])
+async def get_places_nearby(
+    lat: float = Query(..., ge=-90, le=90, description="Latitude of the search center."),
+    lng: float = Query(..., ge=-180, le=180, description="Longitude of the search center."),
+    radius_m: float = Query(1000, gt=0, description="Search radius in meters."),
+    category: Optional[str] = Query(None, description="Only return places with this category (e.g., 'Hotel'). Case-insensitive."),
+    max_age_hours: Optional[float] = Query(None, gt=0, description="Only return places scraped within this many hours."),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of places to return, nearest first."),
+    fallback: bool = Query(False, description="Scrape live if the store has fewer than min_results matching places."),
+    min_results: int = Query(1, ge=1, description="Minimum number of stored places before falling back to a live scrape."),
+    fallback_query: Optional[str] = Query(None, description="Query for the live scrape. Defaults to '<category> near <lat>,<lng>'."),
+    max_places: Optional[int] = Query(None, description="Maximum number of places for the live scrape."),
+    lang: str = Query("en", description="Language code for the live scrape."),
+    headless: bool = Query(True, description="Run the browser in headless mode for the live scrape.")
+):
+    """
+    Returns stored places within radius_m of a point, nearest first, each with its distance_m.
+    """
+    max_age_seconds = max_age_hours * 3600 if max_age_hours else None
+    if not fallback_query and category:
+        fallback_query = f"{category} near {lat},{lng}"
+    return await search_store_with_fallback(
+        lambda: place_store.search_radius(lat, lng, radius_m, category, max_age_seconds, limit),
+        fallback, fallback_query, min_results, max_places, lang, headless
+    )
+
+@app.get("/places/bbox", response_model=Dict[str, Any])
+async def get_places_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90, description="Southern edge of the box."),
+    min_lng: float = Query(..., ge=-180, le=180, description="Western edge of the box. Greater than max_lng for a box crossing the antimeridian."),
+    max_lat: float = Query(..., ge=-90, le=90, description="Northern edge of the box."),
+    max_lng: float = Query(..., ge=-180, le=180, description="Eastern edge of the box."),
+    category: Optional[str] = Query(None, description="Only return places with this category (e.g., 'Hotel'). Case-insensitive."),
+    max_age_hours: Optional[float] = Query(None, gt=0, description="Only return places scraped within this many hours."),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of places to return, most recently scraped first."),
+    fallback: bool = Query(False, description="Scrape live if the store has fewer than min_results matching places."),
+    min_results: int = Query(1, ge=1, description="Minimum number of stored places before falling back to a live scrape."),
+    fallback_query: Optional[str] = Query(None, description="Query for the live scrape. Defaults to '<category> near <box center>'."),
+    max_places: Optional[int] = Query(None, description="Maximum number of places for the live scrape."),
+    lang: str = Query("en", description="Language code for the live scrape."),
+    headless: bool = Query(True, description="Run the browser in headless mode for the live scrape.")
+):
+    """
+    Returns stored places inside a bounding box, most recently scraped first.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat must not be greater than max_lat.")
+    max_age_seconds = max_age_hours * 3600 if max_age_hours else None
+    if not fallback_query and category:
+        # A box with min_lng > max_lng crosses the antimeridian
+        center_lng = normalize_longitude(min_lng + ((max_lng - min_lng) % 360) / 2)
+        fallback_query = f"{category} near {(min_lat + max_lat) / 2},{center_lng}"
+    return await search_store_with_fallback(
+        lambda: place_store.search_bbox(min_lat, min_lng, max_lat, max_lng, category, max_age_seconds, limit),
+        fallback, fallback_query, min_results, max_places, lang, headless
+    )
+
+class RefreshRequest(BaseModel):
+    places: List[str] = Field(..., min_length=1, description="Place links or feature IDs (0x...:0x...) to refresh.")
+    lang: str = Field("en", description="Language code for Google Maps results. A different language than the last snapshot reports localized fields as changed.")
+    headless: bool = Field(True, description="Run the browser in headless mode (no UI). Set to false for debugging locally.")
+    concurrency: int = Field(DEFAULT_BATCH_CONCURRENCY, ge=1, le=16, description="Number of place pages scraped in parallel.")
+
+class WatchlistEntry(BaseModel):
+    place: str = Field(..., description="Place link or feature ID (0x...:0x...) to watch.")
+    priority: float = Field(1.0, gt=0, description="Higher priority places are refreshed first when equally stale.")
+    refresh_interval_hours: float = Field(24.0, gt=0, description="How often the place should be refreshed.")
+
+class WatchlistRequest(BaseModel):
+    places: List[WatchlistEntry] = Field(..., min_length=1, description="Places to add to (or update in) the watchlist.")
+    lang: str = Field("en", description="Language code the places are refreshed in. Use the language they were scraped in, or localized fields will show up as changed.")
+
+@app.post("/refresh", response_model=Dict[str, Any])
+async def run_refresh(request: RefreshRequest):
+    """
+    Scrapes only the given places and returns those that are new or changed since their last snapshot.
+    """
+    logging.info(f"Received refresh request for {len(request.places)} places, concurrency: {request.concurrency}")
+    try:
+        targets = list(dict.fromkeys(await run_store(
+            lambda: [place_store.resolve_place(place, request.lang) for place in request.places])))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        result = await refresh_places(targets, request.lang, request.headless, request.concurrency)
+        logging.info(f"Refresh finished: {result['checked']} checked, {len(result['changed'])} changed, {len(result['failed'])} failed.")
+        return result
+    except ImportError as e:
+         logging.error(f"ImportError during refresh: {e}")
+         raise HTTPException(status_code=500, detail="Server configuration error: Scraper not available.")
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        logging.error(f"An error occurred during refresh: {e}\n{error_trace}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An internal error occurred during refresh: {str(e)}\n\nFull trace:\n{error_trace}")
+
+@app.post("/watchlist", response_model=Dict[str, Any])
+def add_to_watchlist(request: WatchlistRequest):
+    """
+    Adds places to the watchlist, or updates their priority and refresh interval.
+    """
+    try:
+        keys = place_store.add_to_watchlist([entry.model_dump() for entry in request.places], request.lang)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"watched": keys}
+
+@app.delete("/watchlist", response_model=Dict[str, Any])
+def remove_from_watchlist(
+    place_key: List[str] = Query(..., description="place_keys to stop watching.")
+):
+    """
+    Removes places from the watchlist.
+    """
+    return {"removed": place_store.remove_from_watchlist(place_key)}
+
+@app.get("/watchlist/due", response_model=List[Dict[str, Any]])
+def get_due_watchlist(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of places to return.")
+):
+    """
+    Lists watched places that are due for a refresh, most urgent first.
+    """
+    return place_store.get_due_watchlist(limit)
+
+@app.post("/watchlist/refresh", response_model=Dict[str, Any])
+async def run_watchlist_refresh(
+    limit: int = Query(WATCHLIST_REFRESH_BATCH_SIZE, ge=1, description="Maximum number of due places to refresh."),
+    headless: bool = Query(True, description="Run the browser in headless mode (no UI). Set to false for debugging locally."),
+    concurrency: int = Query(DEFAULT_BATCH_CONCURRENCY, ge=1, le=16, description="Number of place pages scraped in parallel.")
+):
+    """
+    Refreshes the most urgent due watchlist places, each in the language it was added with,
+    and returns those that changed.
+    """
+    try:
+        result = await refresh_due_watchlist(limit, headless, concurrency)
+        logging.info(f"Watchlist refresh finished: {result['checked']} checked, {len(result['changed'])} changed, {len(result['failed'])} failed.")
+        return result
+    except ImportError as e:
+         logging.error(f"ImportError during watchlist refresh: {e}")
+         raise HTTPException(status_code=500, detail="Server configuration error: Scraper not available.")
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        logging.error(f"An error occurred during watchlist refresh: {e}\n{error_trace}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An internal error occurred during watchlist refresh: {str(e)}\n\nFull trace:\n{error_trace}")
+
+@app.get("/watchlist/changes", response_model=List[Dict[str, Any]])
+def get_watchlist_changes(
+    since_hours: float = Query(24.0, gt=0, description="Return places that changed within this many hours.")
+):
+    """
+    Lists places whose watched fields changed recently, e.g. during scheduled refreshes.
+    """
+    return place_store.get_changes(time.time() - since_hours * 3600)
+
 
 # Basic root endpoint for health check or info
 @app.get("/")
@@ -0,0 +1,29 @@
+import re
+from urllib.parse import urlencode, urlsplit, unquote
+
+# --- Constants ---
+PLACE_URL = "https://www.google.com/maps/"
+FEATURE_ID_REGEX = r'0x[0-9a-f]+:0x[0-9a-f]+'  # Place feature ID, as used in place links
+PLACE_FEATURE_ID_PATTERN = re.compile(rf'!1s({FEATURE_ID_REGEX})')  # Place feature ID inside a place link
+
+# --- Helper Functions ---
+def is_feature_id(place_id):
+    """Returns True if place_id is a feature ID (0x...:0x...), the ID place_key uses."""
+    return re.fullmatch(FEATURE_ID_REGEX, place_id) is not None
+
+def create_place_url(feature_id, lang="en"):
+    """Creates a Google Maps URL that opens a place directly from its feature ID."""
+    return PLACE_URL + "?" + urlencode({'ftid': feature_id, 'hl': lang})
+
+def place_key(link):
+    """
+    Returns a stable key for a place link so the same place reached through
+    different queries (whose links differ in tracking params) can be deduplicated.
+    Uses the feature ID embedded in the link data (!1s0x...:0x...) when present.
+    """
+    decoded = unquote(link)
+    match = PLACE_FEATURE_ID_PATTERN.search(decoded)
+    if match:
+        return match.group(1)
+    parts = urlsplit(decoded)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
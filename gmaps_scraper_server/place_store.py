@@ -0,0 +1,388 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from .place_links import place_key, create_place_url, is_feature_id
+
+# --- Constants ---
+DEFAULT_STORE_PATH = os.getenv("PLACE_STORE_PATH", os.path.join("data", "places.db"))
+METERS_PER_DEGREE_LAT = 111320.0 # Approximate length of one degree of latitude
+EARTH_RADIUS_M = 6371000.0
+WATCHED_FIELDS = ("name", "address", "rating", "reviews_count", "phone", "website", "categories") # Fields compared by change detection
+DEFAULT_REFRESH_INTERVAL_HOURS = 24.0
+
+# --- Helper Functions ---
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Returns the great-circle distance in meters between two coordinates."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def normalize_longitude(lng):
+    """Wraps a longitude into [-180, 180)."""
+    return (lng + 180.0) % 360.0 - 180.0
+
+def radius_to_bbox(lat, lng, radius_m):
+    """
+    Returns the (min_lat, min_lng, max_lat, max_lng) box enclosing a circle. Longitudes are
+    normalized, so a box crossing the antimeridian has min_lng > max_lng (see search_bbox).
+    """
+    d_lat = radius_m / METERS_PER_DEGREE_LAT
+    min_lat, max_lat = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+    cos_lat = math.cos(math.radians(lat))
+    d_lng = radius_m / (METERS_PER_DEGREE_LAT * cos_lat) if cos_lat > 1e-6 else 360.0
+    if d_lng >= 180.0 or min_lat == -90.0 or max_lat == 90.0:
+        # The circle spans all longitudes (or covers a pole)
+        return min_lat, -180.0, max_lat, 180.0
+    return min_lat, normalize_longitude(lng - d_lng), max_lat, normalize_longitude(lng + d_lng)
+
+def get_record_key(place):
+    """Returns the key a scraped place is stored under (see place_links.place_key)."""
+    if place.get("place_key"):
+        return place["place_key"]
+    if place.get("link"):
+        return place_key(place["link"])
+    return place.get("place_id")
+
+def normalize_place(place):
+    """Returns the watched fields of a place in a canonical form for change detection."""
+    normalized = {}
+    for field in WATCHED_FIELDS:
+        value = place.get(field)
+        if isinstance(value, str):
+            value = " ".join(value.split())
+        elif isinstance(value, list):
+            # Items may be of mixed types (e.g. None from safe_get), so sort with a total key
+            value = sorted((" ".join(item.split()) if isinstance(item, str) else item for item in value),
+                           key=lambda item: (item is None, type(item).__name__, json.dumps(item, sort_keys=True, default=str)))
+        normalized[field] = value
+    return normalized
+
+def hash_place(normalized):
+    """Returns a stable hash of a normalized place."""
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+class PlaceStore:
+    """
+    Persistent SQLite store of scraped places with an R-tree index on coordinates and
+    an index on categories, so radius/bounding-box lookups don't need a new scrape.
+    Falls back to a plain (latitude, longitude) index if SQLite lacks the R-tree module.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.has_rtree = True
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS places (
+                    id INTEGER PRIMARY KEY,
+                    place_key TEXT NOT NULL UNIQUE,
+                    latitude REAL,
+                    longitude REAL,
+                    data TEXT NOT NULL,
+                    scraped_at REAL NOT NULL
+                )""")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS place_categories (
+                    category TEXT NOT NULL COLLATE NOCASE,
+                    place_id INTEGER NOT NULL REFERENCES places(id),
+                    PRIMARY KEY (category, place_id)
+                ) WITHOUT ROWID""")
+            try:
+                self._conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS place_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)")
+            except sqlite3.OperationalError as e:
+                logging.warning(f"SQLite R-tree module not available ({e}), using a plain coordinate index.")
+                self.has_rtree = False
+                self._conn.execute("CREATE INDEX IF NOT EXISTS places_lat_lng ON places (latitude, longitude)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS place_snapshots (
+                    place_key TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    normalized TEXT NOT NULL,
+                    checked_at REAL NOT NULL,
+                    changed_at REAL NOT NULL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS place_snapshots_changed_at ON place_snapshots (changed_at)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS watchlist (
+                    place_key TEXT PRIMARY KEY,
+                    link TEXT NOT NULL,
+                    priority REAL NOT NULL DEFAULT 1,
+                    refresh_interval_hours REAL NOT NULL,
+                    added_at REAL NOT NULL,
+                    last_checked REAL,
+                    lang TEXT NOT NULL DEFAULT 'en'
+                )""")
+            # Watchlists created before places kept their language
+            columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(watchlist)")]
+            if "lang" not in columns:
+                self._conn.execute("ALTER TABLE watchlist ADD COLUMN lang TEXT NOT NULL DEFAULT 'en'")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add_places(self, places, scraped_at=None):
+        """
+        Inserts or updates scraped places (as returned by extract_place_data, with 'link').
+
+        Returns:
+            int: The number of places stored. Places without a usable key are skipped.
+        """
+        scraped_at = scraped_at or time.time()
+        stored = 0
+        with self._lock, self._conn:
+            for place in places:
+                key = get_record_key(place)
+                if not key:
+                    continue
+                coordinates = place.get("coordinates") or {}
+                lat = coordinates.get("latitude")
+                lng = coordinates.get("longitude")
+                data = {k: v for k, v in place.items() if k != "place_key"}
+                self._conn.execute(
+                    """INSERT INTO places (place_key, latitude, longitude, data, scraped_at) VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(place_key) DO UPDATE SET latitude = excluded.latitude, longitude = excluded.longitude,
+                       data = excluded.data, scraped_at = excluded.scraped_at""",
+                    (key, lat, lng, json.dumps(data), scraped_at))
+                row_id = self._conn.execute("SELECT id FROM places WHERE place_key = ?", (key,)).fetchone()["id"]
+
+                self._conn.execute("DELETE FROM place_categories WHERE place_id = ?", (row_id,))
+                categories = place.get("categories") or []
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO place_categories (category, place_id) VALUES (?, ?)",
+                    [(category, row_id) for category in categories if isinstance(category, str)])
+
+                if self.has_rtree:
+                    self._conn.execute("DELETE FROM place_rtree WHERE id = ?", (row_id,))
+                    if lat is not None and lng is not None:
+                        self._conn.execute(
+                            "INSERT INTO place_rtree (id, min_lat, max_lat, min_lng, max_lng) VALUES (?, ?, ?, ?, ?)",
+                            (row_id, lat, lat, lng, lng))
+                stored += 1
+        return stored
+
+    def search_bbox(self, min_lat, min_lng, max_lat, max_lng, category=None, max_age_seconds=None, limit=None):
+        """
+        Returns stored places inside a bounding box, most recently scraped first, optionally
+        restricted to a category (case-insensitive exact match) and to places scraped within
+        max_age_seconds. A box with min_lng > max_lng crosses the antimeridian and is searched
+        as two boxes. Each place has its 'place_key' and 'scraped_at' (unix time) added.
+        """
+        if min_lng <= max_lng:
+            return self._search_single_bbox(min_lat, min_lng, max_lat, max_lng, category, max_age_seconds, limit)
+        places = (self._search_single_bbox(min_lat, min_lng, max_lat, 180.0, category, max_age_seconds, limit)
+                  + self._search_single_bbox(min_lat, -180.0, max_lat, max_lng, category, max_age_seconds, limit))
+        places.sort(key=lambda place: place["scraped_at"], reverse=True)
+        return places[:limit] if limit is not None else places
+
+    def _search_single_bbox(self, min_lat, min_lng, max_lat, max_lng, category, max_age_seconds, limit):
+        if self.has_rtree:
+            sql = """SELECT p.place_key, p.data, p.scraped_at FROM place_rtree r JOIN places p ON p.id = r.id
+                     WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lng >= ? AND r.min_lng <= ?
+                     AND p.latitude BETWEEN ? AND ? AND p.longitude BETWEEN ? AND ?"""
+            # The R-tree stores rounded 32-bit floats, so the exact columns are checked too
+            params = [min_lat, max_lat, min_lng, max_lng] * 2
+        else:
+            sql = """SELECT p.place_key, p.data, p.scraped_at FROM places p
+                     WHERE p.latitude BETWEEN ? AND ? AND p.longitude BETWEEN ? AND ?"""
+            params = [min_lat, max_lat, min_lng, max_lng]
+        if category:
+            sql += " AND p.id IN (SELECT place_id FROM place_categories WHERE category = ?)"
+            params.append(category)
+        if max_age_seconds is not None:
+            sql += " AND p.scraped_at >= ?"
+            params.append(time.time() - max_age_seconds)
+        sql += " ORDER BY p.scraped_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        places = []
+        for row in rows:
+            place = json.loads(row["data"])
+            place["place_key"] = row["place_key"]
+            place["scraped_at"] = row["scraped_at"]
+            places.append(place)
+        return places
+
+    def search_radius(self, lat, lng, radius_m, category=None, max_age_seconds=None, limit=None):
+        """
+        Returns stored places within radius_m meters of (lat, lng), nearest first,
+        each with its 'distance_m'. Filters as in search_bbox.
+        """
+        candidates = self.search_bbox(*radius_to_bbox(lat, lng, radius_m), category=category,
+                                      max_age_seconds=max_age_seconds)
+        places = []
+        for place in candidates:
+            coordinates = place["coordinates"]
+            distance = haversine_m(lat, lng, coordinates["latitude"], coordinates["longitude"])
+            if distance <= radius_m:
+                place["distance_m"] = round(distance, 1)
+                places.append(place)
+        places.sort(key=lambda place: place["distance_m"])
+        return places[:limit] if limit is not None else places
+
+    # --- Change Detection ---
+    def resolve_place(self, target, lang="en"):
+        """
+        Resolves a place link or feature ID (0x...:0x...) to the (place_key, link) used to
+        refresh it. Known places reuse their stored link; unknown IDs get a direct place URL.
+        Other IDs (e.g. ChIJ... place IDs) are rejected with ValueError, since they would
+        not match the keys of the same place found by a search.
+        """
+        if target.startswith(("http://", "https://")):
+            return place_key(target), target
+        if not is_feature_id(target):
+            raise ValueError(f"Unsupported place ID '{target}': use a place link or a feature ID (0x...:0x...).")
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM places WHERE place_key = ?", (target,)).fetchone()
+        link = json.loads(row["data"]).get("link") if row else None
+        return target, link or create_place_url(target, lang)
+
+    def record_snapshots(self, places, checked_at=None):
+        """
+        Saves freshly scraped places and compares them with their last snapshot.
+
+        Returns:
+            list: The places that are new or whose watched fields changed, each with its
+                  'place_key', 'change' ('new' or 'updated') and 'changed_fields'.
+        """
+        checked_at = checked_at or time.time()
+        self.add_places(places, scraped_at=checked_at)
+        changes = []
+        with self._lock, self._conn:
+            for place in places:
+                key = get_record_key(place)
+                if not key:
+                    continue
+                normalized = normalize_place(place)
+                content_hash = hash_place(normalized)
+                row = self._conn.execute(
+                    "SELECT content_hash, normalized FROM place_snapshots WHERE place_key = ?", (key,)).fetchone()
+
+                if row and row["content_hash"] == content_hash:
+                    self._conn.execute("UPDATE place_snapshots SET checked_at = ? WHERE place_key = ?", (checked_at, key))
+                    continue
+
+                self._conn.execute(
+                    """INSERT INTO place_snapshots (place_key, content_hash, normalized, checked_at, changed_at) VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(place_key) DO UPDATE SET content_hash = excluded.content_hash,
+                       normalized = excluded.normalized, checked_at = excluded.checked_at, changed_at = excluded.changed_at""",
+                    (key, content_hash, json.dumps(normalized), checked_at, checked_at))
+                change = dict(place, place_key=key)
+                if row:
+                    previous = json.loads(row["normalized"])
+                    change["change"] = "updated"
+                    change["changed_fields"] = [field for field in WATCHED_FIELDS if previous.get(field) != normalized[field]]
+                else:
+                    change["change"] = "new"
+                    change["changed_fields"] = [field for field in WATCHED_FIELDS if normalized[field] is not None]
+                changes.append(change)
+        return changes
+
+    def get_changes(self, since):
+        """Returns stored places whose watched fields changed at or after the unix time since."""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT p.place_key, p.data, s.changed_at FROM place_snapshots s JOIN places p ON p.place_key = s.place_key
+                   WHERE s.changed_at >= ? ORDER BY s.changed_at DESC""", (since,)).fetchall()
+        places = []
+        for row in rows:
+            place = json.loads(row["data"])
+            place["place_key"] = row["place_key"]
+            place["changed_at"] = row["changed_at"]
+            places.append(place)
+        return places
+
+    # --- Watchlist ---
+    def add_to_watchlist(self, entries, lang="en"):
+        """
+        Adds or updates watched places. Each entry is a dict with a 'place' link or feature ID
+        and optional 'priority' and 'refresh_interval_hours'. The places are refreshed in lang,
+        so their localized fields compare with the same language. Raises ValueError as resolve_place.
+
+        Returns:
+            list: The place_keys of the watched places, without duplicates.
+        """
+        resolved = [(entry, *self.resolve_place(entry["place"], lang)) for entry in entries]
+        now = time.time()
+        with self._lock, self._conn:
+            for entry, key, link in resolved:
+                self._conn.execute(
+                    """INSERT INTO watchlist (place_key, link, priority, refresh_interval_hours, added_at, lang) VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(place_key) DO UPDATE SET link = excluded.link, priority = excluded.priority,
+                       refresh_interval_hours = excluded.refresh_interval_hours, lang = excluded.lang""",
+                    (key, link, entry.get("priority") or 1.0,
+                     entry.get("refresh_interval_hours") or DEFAULT_REFRESH_INTERVAL_HOURS, now, lang))
+        return list(dict.fromkeys(key for _, key, _ in resolved))
+
+    def remove_from_watchlist(self, keys):
+        """Removes places from the watchlist. Returns the number removed."""
+        with self._lock, self._conn:
+            return self._conn.executemany("DELETE FROM watchlist WHERE place_key = ?", [(key,) for key in keys]).rowcount
+
+    def get_due_watchlist(self, limit=None, now=None):
+        """
+        Returns watched places whose refresh interval has passed, most urgent first.
+        Urgency is staleness (time since last check / refresh interval) times priority;
+        places that were never checked come first.
+        """
+        with self._lock:
+            return self._select_due_watchlist(limit, now or time.time())
+
+    def claim_due_watchlist(self, limit=None, now=None):
+        """
+        Returns the most urgent due places like get_due_watchlist and marks them checked in
+        the same transaction, so a failed refresh doesn't keep them at the head of the schedule
+        and a concurrent refresh doesn't pick them up again.
+        """
+        now = now or time.time()
+        with self._lock, self._conn:
+            due = self._select_due_watchlist(limit, now)
+            self._conn.executemany("UPDATE watchlist SET last_checked = ? WHERE place_key = ?",
+                                   [(now, entry["place_key"]) for entry in due])
+        return due
+
+    def retry_watchlist_later(self, keys, retry_seconds, now=None):
+        """
+        Makes claimed places due again after retry_seconds (or their refresh interval, if
+        shorter), so places whose refresh failed are retried soon instead of a full interval later.
+        """
+        now = now or time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE watchlist SET last_checked = ? - MAX(refresh_interval_hours * 3600.0 - ?, 0) WHERE place_key = ?",
+                [(now, retry_seconds, key) for key in keys])
+
+    def _select_due_watchlist(self, limit, now):
+        sql = """SELECT place_key, link, lang, priority, refresh_interval_hours, last_checked,
+                        (? - last_checked) / (refresh_interval_hours * 3600.0) AS staleness
+                 FROM watchlist
+                 WHERE last_checked IS NULL OR ? - last_checked >= refresh_interval_hours * 3600.0
+                 ORDER BY last_checked IS NOT NULL, staleness * priority DESC"""
+        params = [now, now]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._conn.execute(sql, params).fetchall()]